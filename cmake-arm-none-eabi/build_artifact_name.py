@@ -21,17 +21,17 @@ def build_artifact_name(project: str, configuration: str, tag: str) -> str:
     project_s = sanitize(project)
     tag_s = sanitize(tag)
     parts = configuration.split('_') if configuration else []
-    parts_s = [sanitize(p) for p in parts]
+    parts_s = []
 
-    for i, p in enumerate(parts_s):
-        if p.startswith('hw'):
-            new_parts = parts_s[:i+1] + [tag_s] + parts_s[i+1:]
+    # Sanitize parts up to the first hardware field, then the remaining tail (each part is sanitized once).
+    for i, p in enumerate(parts):
+        p_s = sanitize(p)
+        parts_s.append(p_s)
+        if p_s.startswith('hw'):
+            new_parts = parts_s + [tag_s] + [sanitize(x) for x in parts[i+1:]]
             return f"{project_s}_{'_'.join(new_parts)}"
-    # No hardware field found: prefix with the tag directly.
-    if parts_s:
-        return f"{project_s}_{tag_s}_{'_'.join(parts_s)}"
-    else:
-        return f"{project_s}_{tag_s}"
+    # No hardware field found: all parts are already sanitized, prefix them with the tag directly.
+    return '_'.join([project_s, tag_s] + parts_s)
 
 def main() -> None:
     parser = argparse.ArgumentParser(description="Build artifact name")
@@ -8,16 +8,57 @@
 
 from __future__ import annotations
 import argparse
+import functools
 import json
 import os
-import re
 import sys
-from collections import OrderedDict
 from typing import Any, List
 
+# Use orjson when available (faster parsing), fallback to the standard library.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 Primitive = (str, int, float, bool, type(None))
 
+# Translation table replacing any ASCII character not a-z, 0-9 or hyphen with hyphen.
+_SANITIZE_ALLOWED = 'abcdefghijklmnopqrstuvwxyz0123456789-'
+_SANITIZE_TABLE = {c: (chr(c) if chr(c) in _SANITIZE_ALLOWED else '-') for c in range(128)}
+
+
+def _contains_float(data: Any) -> bool:
+    """Return True if any value nested in data is a float."""
+    stack = [data]
+    while stack:
+        v = stack.pop()
+        if isinstance(v, float):
+            return True
+        if isinstance(v, dict):
+            stack.extend(v.values())
+        elif isinstance(v, list):
+            stack.extend(v)
+    return False
+
+
+def load_json(raw: bytes) -> Any:
+    """
+    Parse JSON bytes, using orjson when available.
+    orjson turns integers wider than 64 bits into floats and rejects NaN, Infinity and out of range
+    floats, so when it fails or returns any float the input is parsed again with the standard library.
+    This keeps the generated files independent of whether orjson is installed.
+    """
+    if orjson is not None:
+        try:
+            data = orjson.loads(raw)
+        except orjson.JSONDecodeError:
+            pass
+        else:
+            if not _contains_float(data):
+                return data
+    return json.loads(raw)
+
 
 def sanitize_value_for_filename(s: Any) -> str:
     """
@@ -31,72 +72,52 @@ def sanitize_value_for_filename(s: Any) -> str:
     """
     if s is None:
         return "none"
-    s_str = str(s).strip().lower()
+    return _sanitize_string_for_filename(str(s))
+
+
+@functools.lru_cache(maxsize=1024)
+def _sanitize_string_for_filename(s_str: str) -> str:
+    """Cached implementation of sanitize_value_for_filename for string inputs."""
+    s_str = s_str.strip().lower()
     if not s_str:
         return "empty"
     # Replace underscores by hyphens first
     s_str = s_str.replace("_", "-")
-    # Replace any character not a-z, 0-9 or hyphen with hyphen
-    s_str = re.sub(r'[^a-z0-9-]+', '-', s_str)
+    # Replace any character not a-z, 0-9 or hyphen with hyphen (non-ASCII characters become '?' first)
+    s_str = s_str.encode('ascii', 'replace').decode('ascii').translate(_SANITIZE_TABLE)
     # Collapse multiple hyphens
-    s_str = re.sub(r'-{2,}', '-', s_str)
+    while '--' in s_str:
+        s_str = s_str.replace('--', '-')
     # Strip leading/trailing hyphens
     s_str = s_str.strip('-')
     return s_str or "empty"
 
 
-def stringify_primitive(v: Any) -> str:
-    """Convert a primitive value to string; booleans become ON/OFF."""
-    if isinstance(v, bool):
-        return "ON" if v else "OFF"
-    if v is None:
-        return ""
-    return str(v)
-
-
-def collect_dict_flags(d: Any) -> OrderedDict:
+def collect_dict_flags(d: Any) -> dict:
     """
-    If d is a dict, return an OrderedDict sorted by key containing key -> stringified value.
-    Non-primitive values are ignored. If d is not a dict, return an empty OrderedDict.
+    If d is a dict, return a dict sorted by key containing key -> stringified value
+    (booleans become ON/OFF, None becomes an empty string).
+    Non-primitive values are ignored. If d is not a dict, return an empty dict.
     """
-    out = OrderedDict()
     if not isinstance(d, dict):
-        return out
-    for k in sorted(d.keys()):
-        v = d[k]
-        if isinstance(v, Primitive):
-            out[k] = stringify_primitive(v)
-        else:
-            # Ignore non-primitive values
-            continue
-    return out
+        return {}
+    return {
+        k: ("ON" if v is True else "OFF" if v is False else "" if v is None else str(v))
+        for k, v in sorted(d.items())
+        if isinstance(v, Primitive)
+    }
 
 
-def merge_flags(hw_flags: OrderedDict, sw_flags: OrderedDict) -> OrderedDict:
+def merge_flags(hw_flags: dict, sw_flags: dict) -> dict:
     """
     Merge hw_flags and sw_flags; sw_flags keys override hw_flags keys.
     """
-    merged = OrderedDict()
-    for k, v in hw_flags.items():
-        merged[k] = v
-    for k, v in sw_flags.items():
-        merged[k] = v
-    return merged
-
-
-def is_numeric_string(s: str) -> bool:
-    """
-    Returns True if the string represents an integer or floating point number,
-    including optional exponent (scientific) notation.
-    """
-    if s == "":
-        return False
-    return bool(re.fullmatch(r'[+-]?\d+(\.\d+)?([eE][+-]?\d+)?', s))
+    return {**hw_flags, **sw_flags}
 
 
-def flags_to_lines(flags: OrderedDict) -> List[str]:
+def flags_to_lines(flags: dict) -> List[str]:
     """
-    Convert OrderedDict into a list of flag lines, one flag per line:
+    Convert flags dict into a list of flag lines, one flag per line:
       -DKEY=VALUE
       -DKEY   (when VALUE is empty)
     Notes:
@@ -107,19 +128,16 @@ def flags_to_lines(flags: OrderedDict) -> List[str]:
     """
     parts: List[str] = []
     for k, v in flags.items():
-        if v == "":
-            parts.append(f"-D{k}")
-        else:
-            # Do not quote ON/OFF and numeric values; for other strings, write raw value (no quotes).
-            if v in ("ON", "OFF") or is_numeric_string(v):
-                parts.append(f"-D{k}={v}")
-            else:
-                # Write value as-is (no surrounding quotes). Keep original escaping of quotes/backslashes if any.
-                parts.append(f"-D{k}={v}")
+        parts.append(f"-D{k}" if v == "" else f"-D{k}={v}")
     return parts
 
 
-def hw_filename_base_from_hw_flags(hw_flags: OrderedDict, hw_index: int) -> str:
+def flags_to_byte_lines(flags: dict) -> List[bytes]:
+    """Same as flags_to_lines, with each line UTF-8 encoded for writing to a file."""
+    return [line.encode('utf-8') for line in flags_to_lines(flags)]
+
+
+def hw_filename_base_from_hw_flags(hw_flags: dict, hw_index: int) -> str:
     """
     Build the filename base by concatenating hw_flags values (deterministic by key order),
     joined with underscores between tokens. Each token is sanitized by sanitize_value_for_filename.
@@ -131,22 +149,40 @@ def hw_filename_base_from_hw_flags(hw_flags: OrderedDict, hw_index: int) -> str:
     return f"hw{hw_index}"
 
 
+def write_flags_file(out_path: str, lines: List[bytes]) -> None:
+    """
+    Write one flag per line to out_path, ensuring the file ends with a newline.
+    Uses a raw file descriptor to avoid the text wrapper setup cost for each file.
+    """
+    fd = os.open(out_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+    try:
+        # os.write may write less than requested: loop until the whole buffer is written.
+        view = memoryview(b"\n".join(lines) + b"\n")
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+
 def main() -> None:
     
     parser = argparse.ArgumentParser(description="Generate flag files from hw_flags / sw_flags in JSON.")
     parser.add_argument('-i', '--input', required=True, help='Input JSON file (required)')
     parser.add_argument('-o', '--outdir', required=True, help='Output directory (required)')
     parser.add_argument('--dry-run', action='store_true', help="Do not write files; print what would be created.")
+    parser.add_argument('--dry-run-names-only', action='store_true', help="Same as --dry-run but only print the file names.")
     args = parser.parse_args()
+    dry_run = args.dry_run or args.dry_run_names_only
 
     # Read input JSON
     try:
-        with open(args.input, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        with open(args.input, 'rb') as f:
+            data = load_json(f.read())
     except FileNotFoundError:
         print(f"Error: input file '{args.input}' not found.", file=sys.stderr)
         sys.exit(2)
-    except json.JSONDecodeError as e:
+    # ValueError also covers json.JSONDecodeError and UnicodeDecodeError.
+    except ValueError as e:
         print(f"Error: failed to parse JSON in '{args.input}': {e}", file=sys.stderr)
         sys.exit(2)
 
@@ -170,6 +206,8 @@ def main() -> None:
         sys.exit(3)
 
     created_files: List[str] = []
+    # Dry run output is buffered and printed once at the end.
+    dry_run_lines: List[str] = []
     fixed_ext = ".txt"
 
     for hw_index, hw in enumerate(hw_list):
@@ -177,7 +215,9 @@ def main() -> None:
             continue
 
         # Extract hw_flags dict (if present)
-        hw_flags_raw = hw.get('hw_flags', {}) if isinstance(hw.get('hw_flags', {}), dict) else {}
+        hw_flags_raw = hw.get('hw_flags')
+        if not isinstance(hw_flags_raw, dict):
+            hw_flags_raw = {}
         hw_flags = collect_dict_flags(hw_flags_raw)
 
         # Filename base from hw_flags values (values sanitized/lowercased & underscores->hyphens)
@@ -185,11 +225,16 @@ def main() -> None:
 
         sw_list = hw.get('sw_configuration_list')
         if sw_list and isinstance(sw_list, list):
+            # Filename parts shared by all sw configurations of this hw.
+            hw_prefix = hw_base + "_"
+            hw_filename = hw_base + fixed_ext
             for sw_index, sw in enumerate(sw_list):
                 if not isinstance(sw, dict):
                     continue
                 sw_name_raw = sw.get('name')
-                sw_flags_raw = sw.get('sw_flags', {}) if isinstance(sw.get('sw_flags', {}), dict) else {}
+                sw_flags_raw = sw.get('sw_flags')
+                if not isinstance(sw_flags_raw, dict):
+                    sw_flags_raw = {}
                 sw_flags = collect_dict_flags(sw_flags_raw)
 
                 merged = merge_flags(hw_flags, sw_flags)
@@ -197,45 +242,47 @@ def main() -> None:
                 # Construct filename: <hw_base>_<sw_name> or <hw_base>_sw{index}
                 if sw_name_raw is not None and str(sw_name_raw).strip() != "":
                     sw_name_token = sanitize_value_for_filename(sw_name_raw)
-                    filename = f"{hw_base}_{sw_name_token}{fixed_ext}"
+                    filename = hw_prefix + sw_name_token + fixed_ext
                 else:
                     # No suffix for the first configuration without name.
                     if sw_index == 0:
-                        filename = f"{hw_base}{fixed_ext}"
+                        filename = hw_filename
                     else:
-                    	filename = f"{hw_base}_sw-conf{sw_index}{fixed_ext}"
+                        filename = f"{hw_prefix}sw-conf{sw_index}{fixed_ext}"
 
                 out_path = os.path.join(args.outdir, filename)
-                lines = flags_to_lines(merged)
 
-                if args.dry_run:
+                if args.dry_run_names_only:
+                    dry_run_lines.append(f"[DRY RUN] {out_path}")
+                elif args.dry_run:
+                    lines = flags_to_lines(merged)
                     combined = "\n".join(lines) if lines else "(no flags)"
-                    print(f"[DRY RUN] {out_path} -> {combined}")
+                    dry_run_lines.append(f"[DRY RUN] {out_path} -> {combined}")
                 else:
                     try:
-                        with open(out_path, 'w', encoding='utf-8') as out_f:
-                            # write one flag per line; ensure file ends with a newline
-                            out_f.write("\n".join(lines) + "\n")
+                        write_flags_file(out_path, flags_to_byte_lines(merged))
                         created_files.append(out_path)
                     except OSError as e:
                         print(f"Error: failed to write file '{out_path}': {e}", file=sys.stderr)
         else:
             filename = f"{hw_base}{fixed_ext}"
             out_path = os.path.join(args.outdir, filename)
-            lines = flags_to_lines(hw_flags)
-            if args.dry_run:
+            if args.dry_run_names_only:
+                dry_run_lines.append(f"[DRY RUN] {out_path}")
+            elif args.dry_run:
+                lines = flags_to_lines(hw_flags)
                 combined = "\n".join(lines) if lines else "(no flags)"
-                print(f"[DRY RUN] {out_path} -> {combined}")
+                dry_run_lines.append(f"[DRY RUN] {out_path} -> {combined}")
             else:
                 try:
-                    with open(out_path, 'w', encoding='utf-8') as out_f:
-                        out_f.write("\n".join(lines) + "\n")
+                    write_flags_file(out_path, flags_to_byte_lines(hw_flags))
                     created_files.append(out_path)
                 except OSError as e:
                     print(f"Error: failed to write file '{out_path}': {e}", file=sys.stderr)
 
-    if args.dry_run:
-        print("Dry run completed.")
+    if dry_run:
+        dry_run_lines.append("Dry run completed.")
+        sys.stdout.write("\n".join(dry_run_lines) + "\n")
     else:
         if created_files:
             print(f"Created files ({len(created_files)}):")